@@ -19,6 +19,35 @@ class Settings(BaseSettings):
     CURSEFORGE_API_URL: str = "https://api.curseforge.com/v1"
     MINECRAFT_GAME_ID: int = 432
     
+    # CurseForge response cache (persistent tier is disabled unless a directory is set)
+    CURSEFORGE_CACHE_DIR: Optional[str] = None
+    CURSEFORGE_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    CURSEFORGE_CACHE_MEMORY_ENTRIES: int = 1024
+    CURSEFORGE_CACHE_TTL_MODS: int = 60 * 60  # seconds
+    CURSEFORGE_CACHE_TTL_FILES: int = 24 * 60 * 60  # seconds
+    
+    # Precompiled catalogue of prepared responses (defaults to .catalogue.cache next to data/)
+    CATALOGUE_CACHE_FILE: Optional[str] = None
+    
+    # Shared prepared catalogue for multi-worker deployments (memory-mapped by every worker)
+    SHARED_CATALOGUE_DIR: Optional[str] = None
+    SHARED_CATALOGUE_CHECK_SECONDS: float = 5.0
+    
+    # Local mirror of modpack zips (disabled unless a directory is set)
+    MODPACK_MIRROR_DIR: Optional[str] = None
+    MODPACK_MIRROR_SYNC_SECONDS: int = 60 * 60
+    MODPACK_MIRROR_POLL_SECONDS: float = 10.0
+    
+    # Resized image variants (disabled unless a directory is set)
+    IMAGE_CACHE_DIR: Optional[str] = None
+    IMAGE_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    
+    # Public URL of this API, used to build absolute links to image variants
+    PUBLIC_BASE_URL: Optional[str] = None
+    
+    # Cached ?fields= projections (entries across languages and field sets)
+    PROJECTION_CACHE_ENTRIES: int = 256
+    
     class Config:
         env_file = ".env"
 
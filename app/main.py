@@ -2,14 +2,67 @@ from fastapi import FastAPI, HTTPException, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from datetime import datetime, timezone
+import logging
+import time
 import uvicorn
 import os
 from typing import Optional
 
-from app.routers import modpacks, curseforge
+from app.models.response import HealthResponse
+from app.routers import modpacks, curseforge, images
+from app.services.curseforge_cache import curseforge_cache
+from app.services.data_loader import data_loader
+from app.services.image_variants import image_variants
+from app.services.modpack_mirror import modpack_mirror
+from app.services.prepared_catalogue import prepared_catalogue
 
 from app.config import settings
 
+logger = logging.getLogger("uvicorn.error")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load, validate and prepare all data before serving; a bad data file aborts startup"""
+    app.state.ready = False
+    started = time.perf_counter()
+
+    data_loader.load()
+    # Targets and mirror-triggered rebuilds both use this revision of data/
+    mirror_targets = {
+        mp["id"]: mp["urlModpackZip"] for mp in data_loader.get_modpacks() if mp.get("urlModpackZip")
+    }
+    modpack_mirror.open()
+    image_variants.open()
+    from_cache = prepared_catalogue.prepare(data_loader)
+    curseforge_cache.open()
+
+    app.state.startup_ms = round((time.perf_counter() - started) * 1000, 1)
+    app.state.ready = True
+    logger.info(
+        "Catalogue revision %s ready in %.1f ms (%s)",
+        prepared_catalogue.revision,
+        app.state.startup_ms,
+        "precompiled catalogue" if from_cache else "built and validated from source"
+    )
+
+    mirror_task = None
+    if modpack_mirror.enabled:
+        # Zips download in the background; responses gain size/SHA-256 as they land
+        mirror_task = asyncio.create_task(
+            modpack_mirror.run(mirror_targets, on_change=lambda: prepared_catalogue.prepare(data_loader))
+        )
+    yield
+    app.state.ready = False
+    if mirror_task is not None:
+        mirror_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await mirror_task
+    curseforge_cache.close()
+    prepared_catalogue.close()
+
 # Create FastAPI app
 app = FastAPI(
     title="LuminaKraft Launcher API",
@@ -17,6 +70,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs" if settings.ENVIRONMENT == "development" else None,
     redoc_url="/redoc" if settings.ENVIRONMENT == "development" else None,
+    lifespan=lifespan,
 )
 
 # Add middleware
@@ -66,15 +120,21 @@ async def custom_cors_filter(request, call_next):
 # Include routers
 app.include_router(modpacks.router, prefix="/v1")
 app.include_router(curseforge.router, prefix="/v1/curseforge")
+app.include_router(images.router, prefix="/v1/images")
 
-@app.get("/health")
+@app.get("/health", response_model=HealthResponse)
 async def health_check():
-    """Health check endpoint"""
-    return {
-        "status": "ok",
-        "timestamp": "2025-08-19T20:46:36.046Z",
-        "version": "1.0.0"
-    }
+    """Health check endpoint; returns 503 until startup has loaded the catalogue"""
+    ready = getattr(app.state, "ready", False)
+    health = HealthResponse(
+        status="ok" if ready else "starting",
+        ready=ready,
+        timestamp=datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+        version="1.0.0",
+        dataRevision=prepared_catalogue.revision,
+        startupMs=getattr(app.state, "startup_ms", None)
+    )
+    return JSONResponse(status_code=200 if ready else 503, content=health.model_dump())
 
 @app.get("/v1/info")
 async def api_info():
@@ -89,9 +149,11 @@ async def api_info():
             "GET /v1/modpacks - Get all modpacks (lightweight with language support)",
             "GET /v1/modpacks/list - List modpacks with basic info only",
             "GET /v1/modpacks/{id} - Get specific modpack with full details",
+            "GET /v1/modpacks/{id}/download - Download mirrored modpack zip (Range supported)",
             "GET /v1/modpacks/{id}/features/{lang} - Get modpack features in specific language",
             "GET /v1/translations - Available languages",
             "GET /v1/translations/{lang} - Get translations for language",
+            "GET /v1/images/{key}/{variant} - Resized image variant (thumbnail, card, full)",
             "GET /v1/curseforge/test - Test CurseForge API connection",
             "GET /v1/curseforge/* - CurseForge API proxy endpoints",
             "GET /v1/info - API information"
@@ -111,9 +173,11 @@ async def not_found_handler(request: Request, exc: HTTPException):
                 "/v1/modpacks",
                 "/v1/modpacks/list", 
                 "/v1/modpacks/{id}",
+                "/v1/modpacks/{id}/download",
                 "/v1/modpacks/{id}/features/{lang}",
                 "/v1/translations",
                 "/v1/translations/{lang}",
+                "/v1/images/{key}/{variant}",
                 "/v1/curseforge/test",
                 "/v1/curseforge/mods/{modId}",
                 "/v1/curseforge/mods/files",
@@ -4,9 +4,16 @@ from pydantic import BaseModel, HttpUrl
 from typing import List, Optional, Dict, Any
 
 
+class ImageVariantLinks(BaseModel):
+    """URLs of the resized WebP variants of one catalogue image"""
+    thumbnail: str
+    card: str
+    full: str
+
 class Collaborator(BaseModel):
     name: str
     logo: Optional[HttpUrl] = None
+    logoVariants: Optional[ImageVariantLinks] = None  # Set when image variants are enabled
 
 class Modpack(BaseModel):
     id: str
@@ -22,9 +29,13 @@ class Modpack(BaseModel):
     isActive: bool = False
     isComingSoon: bool = False
     images: List[HttpUrl]
+    imageVariants: Optional[List[ImageVariantLinks]] = None  # One entry per image, when enabled
     logo: HttpUrl
     backgroundImage: HttpUrl
     urlModpackZip: Optional[HttpUrl] = None
+    modpackZipSize: Optional[int] = None  # Set once the zip is mirrored
+    modpackZipSha256: Optional[str] = None
+    modpackZipMirror: Optional[str] = None
     collaborators: List[Collaborator] = []
     youtubeEmbed: Optional[str] = None
     tiktokEmbed: Optional[str] = None
@@ -51,6 +62,9 @@ class ModpackLightweight(BaseModel):
     isActive: bool = False
     isComingSoon: bool = False
     urlModpackZip: Optional[HttpUrl] = None
+    modpackZipSize: Optional[int] = None
+    modpackZipSha256: Optional[str] = None
+    modpackZipMirror: Optional[str] = None
     ip: Optional[str] = None
 
 class ModpackList(BaseModel):
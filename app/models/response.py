@@ -7,8 +7,11 @@ class ErrorResponse(BaseModel):
 
 class HealthResponse(BaseModel):
     status: str
+    ready: bool
     timestamp: str
     version: str
+    dataRevision: Optional[str] = None
+    startupMs: Optional[float] = None
 
 class APIInfoResponse(BaseModel):
     name: str
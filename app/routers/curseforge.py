@@ -1,9 +1,12 @@
 from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import Response
 from typing import Optional, Dict, Any, List
 from pydantic import BaseModel
+import hashlib
 import httpx
 
 from app.services.auth import rate_limited_user, UserInfo
+from app.services.curseforge_cache import curseforge_cache
 from app.config import settings
 
 class GetModFilesRequest(BaseModel):
@@ -15,6 +18,19 @@ class GetModsRequest(BaseModel):
 
 router = APIRouter()
 
+def _ids_cache_key(prefix: str, ids: List[int], *extra: Any) -> str:
+    """Build a compact cache key for a batch request body"""
+    raw = ",".join(str(i) for i in ids) + "|" + "|".join(str(e) for e in extra)
+    return f"{prefix}:{hashlib.sha1(raw.encode()).hexdigest()}"
+
+def _json_response(body: bytes, cache_status: str) -> Response:
+    """Return raw upstream JSON without re-serializing it"""
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"X-Cache": cache_status}
+    )
+
 @router.get("/test")
 async def test_curseforge_connection(
     user: UserInfo = Depends(rate_limited_user)
@@ -66,6 +82,11 @@ async def get_mod(
     if not settings.CURSEFORGE_API_KEY:
         raise HTTPException(status_code=503, detail="CurseForge API not configured")
     
+    cache_key = f"mods/{mod_id}"
+    cached = await curseforge_cache.get(cache_key)
+    if cached is not None:
+        return _json_response(cached, "HIT")
+    
     try:
         async with httpx.AsyncClient() as client:
             response = await client.get(
@@ -82,7 +103,8 @@ async def get_mod(
             elif response.status_code != 200:
                 raise HTTPException(status_code=response.status_code, detail="CurseForge API error")
             
-            return response.json()
+            await curseforge_cache.set(cache_key, response.content, settings.CURSEFORGE_CACHE_TTL_MODS)
+            return _json_response(response.content, "MISS")
             
     except httpx.RequestError:
         raise HTTPException(status_code=503, detail="Failed to connect to CurseForge API")
@@ -101,6 +123,11 @@ async def get_mods(
         if not request.modIds:
             raise HTTPException(status_code=400, detail="No mod IDs provided")
         
+        cache_key = _ids_cache_key("mods", request.modIds, request.filterPcOnly)
+        cached = await curseforge_cache.get(cache_key)
+        if cached is not None:
+            return _json_response(cached, "HIT")
+        
         async with httpx.AsyncClient() as client:
             response = await client.post(
                 f"{settings.CURSEFORGE_API_URL}/mods",
@@ -119,7 +146,8 @@ async def get_mods(
             if response.status_code != 200:
                 raise HTTPException(status_code=response.status_code, detail="CurseForge API error")
             
-            return response.json()
+            await curseforge_cache.set(cache_key, response.content, settings.CURSEFORGE_CACHE_TTL_MODS)
+            return _json_response(response.content, "MISS")
             
     except httpx.RequestError:
         raise HTTPException(status_code=503, detail="Failed to connect to CurseForge API")
@@ -137,6 +165,11 @@ async def get_mod_files(
         if not request.fileIds:
             raise HTTPException(status_code=400, detail="No file IDs provided")
         
+        cache_key = _ids_cache_key("files", request.fileIds)
+        cached = await curseforge_cache.get(cache_key)
+        if cached is not None:
+            return _json_response(cached, "HIT")
+        
         async with httpx.AsyncClient() as client:
             response = await client.post(
                 f"{settings.CURSEFORGE_API_URL}/mods/files",
@@ -152,7 +185,8 @@ async def get_mod_files(
             if response.status_code != 200:
                 raise HTTPException(status_code=response.status_code, detail="CurseForge API error")
             
-            return response.json()
+            await curseforge_cache.set(cache_key, response.content, settings.CURSEFORGE_CACHE_TTL_FILES)
+            return _json_response(response.content, "MISS")
             
     except httpx.RequestError:
         raise HTTPException(status_code=503, detail="Failed to connect to CurseForge API")
\ No newline at end of file
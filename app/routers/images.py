@@ -0,0 +1,31 @@
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
+
+from app.services.image_variants import image_variants, ImageSourceError
+
+router = APIRouter()
+
+# Images are loaded by <img> tags that cannot send launcher tokens, so this router is
+# public; only images referenced by the catalogue can be requested.
+@router.get("/{image_key}/{variant}")
+async def get_image_variant(image_key: str, variant: str, request: Request):
+    """Get a resized WebP variant (thumbnail, card, full) of a catalogue image"""
+    if not image_variants.enabled:
+        raise HTTPException(status_code=404, detail="Image variants are not enabled")
+    
+    try:
+        result = await image_variants.get(image_key, variant)
+    except (ImageSourceError, OSError):
+        raise HTTPException(status_code=502, detail="Failed to load source image")
+    
+    if result is None:
+        raise HTTPException(status_code=404, detail="Image not found")
+    
+    body, etag = result
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "public, max-age=86400",
+    }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="image/webp", headers=headers)
@@ -1,124 +1,99 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from fastapi.responses import Response
 from typing import Optional
 
-from app.models.modpack import (
-    ModpacksResponse, ModpacksListResponse, Modpack, ModpackLightweight, 
-    ModpackList, UITranslations, ModpackFeatures
-)
+from app.models.modpack import ModpacksResponse, ModpacksListResponse, Modpack
 from app.services.auth import rate_limited_user, UserInfo
-from app.services.data_loader import data_loader
+from app.services.field_projection import modpack_projections
+from app.services.modpack_mirror import modpack_mirror
+from app.services.prepared_catalogue import prepared_catalogue, modpacks_key, modpack_key, LIST_KEY
 
 router = APIRouter()
 
+def _json_response(body: bytes) -> Response:
+    """Serve a prepared body; validation and serialization already happened at startup"""
+    return Response(content=body, media_type="application/json")
+
 @router.get("/modpacks", response_model=ModpacksResponse)
 async def get_modpacks(
     lang: str = Query("en", description="Language code (es, en)"),
+    fields: Optional[str] = Query(None, description="Comma-separated Modpack fields to return (e.g. id,ip,isActive)"),
     user: UserInfo = Depends(rate_limited_user)
 ):
     """Get all modpacks with lightweight data and translations"""
-    try:
-        # Load modpacks and translations
-        modpacks_data = data_loader.get_modpacks()
-        translations = data_loader.get_translations(lang)
-        
-        # Build lightweight modpacks with translations
-        lightweight_modpacks = []
-        for modpack_data in modpacks_data:
-            modpack_id = modpack_data["id"]
-            modpack_translations = translations.get("modpacks", {}).get(modpack_id, {})
-            
-            lightweight_modpack = ModpackLightweight(
-                id=modpack_data["id"],
-                name=modpack_data["name"],
-                shortDescription=modpack_translations.get("shortDescription", ""),
-                version=modpack_data["version"],
-                minecraftVersion=modpack_data["minecraftVersion"],
-                modloader=modpack_data["modloader"],
-                modloaderVersion=modpack_data["modloaderVersion"],
-                gamemode=modpack_data["gamemode"],
-                logo=modpack_data["logo"],
-                backgroundImage=modpack_data["backgroundImage"],
-                primaryColor=modpack_data["primaryColor"],
-                isNew=modpack_data.get("isNew", False),
-                isActive=modpack_data.get("isActive", False),
-                isComingSoon=modpack_data.get("isComingSoon", False),
-                urlModpackZip=modpack_data.get("urlModpackZip"),
-                ip=modpack_data.get("ip")
-            )
-            lightweight_modpacks.append(lightweight_modpack)
-        
-        # Build UI translations
-        ui_translations = UITranslations(
-            status=translations.get("ui", {}).get("status", {}),
-            modloader=translations.get("ui", {}).get("modloader", {}),
-            gamemode=translations.get("ui", {}).get("gamemode", {})
-        )
-        
-        return ModpacksResponse(
-            count=len(lightweight_modpacks),
-            modpacks=lightweight_modpacks,
-            ui=ui_translations
-        )
-        
-    except FileNotFoundError as e:
-        if "translation" in str(e).lower():
+    if not prepared_catalogue.has_language(lang):
+        raise HTTPException(status_code=404, detail=f"Language '{lang}' not supported")
+    
+    if fields is not None:
+        try:
+            body = modpack_projections.modpacks(lang, fields)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if body is None:
             raise HTTPException(status_code=404, detail=f"Language '{lang}' not supported")
-        raise HTTPException(status_code=404, detail="Modpacks data not found")
-    except Exception as e:
+        return _json_response(body)
+    
+    body = prepared_catalogue.get(modpacks_key(lang))
+    if body is None:
         raise HTTPException(status_code=500, detail="Failed to load modpacks data")
+    return _json_response(body)
 
 @router.get("/modpacks/list", response_model=ModpacksListResponse)
 async def get_modpacks_list(
     user: UserInfo = Depends(rate_limited_user)
 ):
     """Get modpacks with minimal info for dropdowns"""
-    try:
-        modpacks_data = data_loader.get_modpacks()
-        
-        modpack_list = [
-            ModpackList(
-                id=mp["id"],
-                name=mp["name"],
-                version=mp["version"],
-                minecraftVersion=mp["minecraftVersion"],
-                modloader=mp["modloader"],
-                modloaderVersion=mp["modloaderVersion"]
-            )
-            for mp in modpacks_data
-        ]
-        
-        return ModpacksListResponse(
-            count=len(modpack_list),
-            modpacks=modpack_list
-        )
-        
-    except Exception as e:
+    body = prepared_catalogue.get(LIST_KEY)
+    if body is None:
         raise HTTPException(status_code=500, detail="Failed to load modpacks list")
+    return _json_response(body)
 
 @router.get("/modpacks/{modpack_id}", response_model=Modpack)
 async def get_modpack(
     modpack_id: str,
     lang: str = Query("en", description="Language code (es, en)"),
+    fields: Optional[str] = Query(None, description="Comma-separated Modpack fields to return"),
     user: UserInfo = Depends(rate_limited_user)
 ):
     """Get specific modpack with full details"""
-    try:
-        modpack_data = data_loader.get_modpack_by_id(modpack_id)
-        if not modpack_data:
+    if not prepared_catalogue.has_modpack(modpack_id):
+        raise HTTPException(
+            status_code=404, 
+            detail=f"Modpack with ID '{modpack_id}' does not exist"
+        )
+    if not prepared_catalogue.has_language(lang):
+        raise HTTPException(status_code=404, detail=f"Language '{lang}' not supported")
+    
+    if fields is not None:
+        try:
+            body = modpack_projections.modpack(lang, modpack_id, fields)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if body is None:
             raise HTTPException(
-                status_code=404, 
+                status_code=404,
                 detail=f"Modpack with ID '{modpack_id}' does not exist"
             )
-        # Get translations for this modpack
-        translations = data_loader.get_translations(lang)
-        modpack_translations = translations.get("modpacks", {}).get(modpack_id, {})
-        modpack_data['description'] = modpack_translations.get('description', "")
-        modpack_data['shortDescription'] = modpack_translations.get('shortDescription', "")
-        # Add features from translations if available
-        features = translations.get("features", {}).get(modpack_id, [])
-        modpack_data['features'] = features
-        return Modpack(**modpack_data)
-    except HTTPException:
-        raise
-    except Exception as e:
+        return _json_response(body)
+    
+    body = prepared_catalogue.get(modpack_key(lang, modpack_id))
+    if body is None:
         raise HTTPException(status_code=500, detail="Failed to load modpack data")
+    return _json_response(body)
+
+@router.api_route("/modpacks/{modpack_id}/download", methods=["GET", "HEAD"])
+async def download_modpack(
+    modpack_id: str,
+    request: Request,
+    user: UserInfo = Depends(rate_limited_user)
+):
+    """Download a mirrored modpack zip (supports Range and If-Range for resuming)"""
+    response = modpack_mirror.file_response(
+        modpack_id,
+        method=request.method,
+        range_header=request.headers.get("range"),
+        if_range=request.headers.get("if-range")
+    )
+    if response is None:
+        raise HTTPException(status_code=404, detail=f"Modpack zip for '{modpack_id}' is not mirrored")
+    return response
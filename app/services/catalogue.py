@@ -0,0 +1,108 @@
+from typing import Callable, List, Dict, Optional
+
+from app.models.modpack import (
+    ModpacksResponse, ModpacksListResponse, Modpack, ModpackLightweight,
+    ModpackList, UITranslations
+)
+
+def build_modpacks_response(
+    modpacks_data: List[Dict],
+    translations: Dict,
+    image_url: Optional[Callable[[str, str], str]] = None
+) -> ModpacksResponse:
+    """Build the lightweight modpacks response for one language.
+
+    image_url maps (source URL, variant) to the URL to publish, so list views can
+    link small image variants instead of the full-size files.
+    """
+    image_url = image_url or (lambda url, variant: url)
+    lightweight_modpacks = []
+    for modpack_data in modpacks_data:
+        modpack_id = modpack_data["id"]
+        modpack_translations = translations.get("modpacks", {}).get(modpack_id, {})
+
+        lightweight_modpack = ModpackLightweight(
+            id=modpack_data["id"],
+            name=modpack_data["name"],
+            shortDescription=modpack_translations.get("shortDescription", ""),
+            version=modpack_data["version"],
+            minecraftVersion=modpack_data["minecraftVersion"],
+            modloader=modpack_data["modloader"],
+            modloaderVersion=modpack_data["modloaderVersion"],
+            gamemode=modpack_data["gamemode"],
+            logo=image_url(modpack_data["logo"], "thumbnail"),
+            backgroundImage=image_url(modpack_data["backgroundImage"], "card"),
+            primaryColor=modpack_data["primaryColor"],
+            isNew=modpack_data.get("isNew", False),
+            isActive=modpack_data.get("isActive", False),
+            isComingSoon=modpack_data.get("isComingSoon", False),
+            urlModpackZip=modpack_data.get("urlModpackZip"),
+            modpackZipSize=modpack_data.get("modpackZipSize"),
+            modpackZipSha256=modpack_data.get("modpackZipSha256"),
+            modpackZipMirror=modpack_data.get("modpackZipMirror"),
+            ip=modpack_data.get("ip")
+        )
+        lightweight_modpacks.append(lightweight_modpack)
+
+    # Build UI translations
+    ui_translations = UITranslations(
+        status=translations.get("ui", {}).get("status", {}),
+        modloader=translations.get("ui", {}).get("modloader", {}),
+        gamemode=translations.get("ui", {}).get("gamemode", {})
+    )
+
+    return ModpacksResponse(
+        count=len(lightweight_modpacks),
+        modpacks=lightweight_modpacks,
+        ui=ui_translations
+    )
+
+def build_modpacks_list(modpacks_data: List[Dict]) -> ModpacksListResponse:
+    """Build the minimal modpacks list used for dropdowns"""
+    modpack_list = [
+        ModpackList(
+            id=mp["id"],
+            name=mp["name"],
+            version=mp["version"],
+            minecraftVersion=mp["minecraftVersion"],
+            modloader=mp["modloader"],
+            modloaderVersion=mp["modloaderVersion"]
+        )
+        for mp in modpacks_data
+    ]
+
+    return ModpacksListResponse(
+        count=len(modpack_list),
+        modpacks=modpack_list
+    )
+
+def build_modpack(
+    modpack_data: Dict,
+    translations: Dict,
+    image_links: Optional[Callable[[str], Dict[str, str]]] = None
+) -> Modpack:
+    """Build the full modpack details for one language.
+
+    image_links maps a source URL to the URLs of its resized variants; when given,
+    screenshots and collaborator logos are published with their variant links.
+    """
+    modpack_id = modpack_data["id"]
+    modpack_translations = translations.get("modpacks", {}).get(modpack_id, {})
+
+    extra = {}
+    if image_links is not None:
+        extra["imageVariants"] = [image_links(url) for url in modpack_data.get("images", [])]
+        extra["collaborators"] = [
+            {**collaborator, "logoVariants": image_links(collaborator["logo"]) if collaborator.get("logo") else None}
+            for collaborator in modpack_data.get("collaborators", [])
+        ]
+
+    return Modpack(
+        **{
+            **modpack_data,
+            **extra,
+            "description": modpack_translations.get("description", ""),
+            "shortDescription": modpack_translations.get("shortDescription", ""),
+            "features": translations.get("features", {}).get(modpack_id, []),
+        }
+    )
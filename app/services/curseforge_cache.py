@@ -0,0 +1,217 @@
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+import anyio
+
+from app.config import settings
+
+logger = logging.getLogger("uvicorn.error")
+
+# How long a disk operation waits for another worker's SQLite write lock before giving up
+DB_BUSY_TIMEOUT_SECONDS = 1.0
+
+class CurseForgeCache:
+    """Two-tier cache for raw CurseForge response bodies.
+
+    The in-memory tier is always active. When a cache directory is configured,
+    entries are also written to a SQLite file so they survive restarts; the
+    memory tier is warmed from it on startup. Disk operations run in worker
+    threads, and disk errors are logged and treated as misses or skipped writes,
+    so the cache never stalls the event loop or fails a request.
+
+    The database may be shared by several workers, so the size cap is always
+    checked against the sizes stored in it, not a per-process count.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_bytes: int = 256 * 1024 * 1024,
+        memory_entries: int = 1024
+    ):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        # Only touched from the event loop
+        self._memory: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        # Serializes use of the shared connection across worker threads
+        self._db_lock = threading.Lock()
+
+    def open(self):
+        """Open the persistent tier (if configured) and warm the memory tier"""
+        if self.cache_dir is None or self._db is not None:
+            return
+
+        try:
+            self._open_db()
+        except (sqlite3.Error, OSError, zlib.error) as e:
+            logger.warning("CurseForge disk cache unavailable, using memory only: %s", e)
+            self.close()
+            self._memory.clear()
+
+    def close(self):
+        """Close the persistent tier"""
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return the cached body for a key, or None if missing or expired"""
+        now = time.time()
+        entry = self._memory.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                self._memory.move_to_end(key)
+                return entry[1]
+            del self._memory[key]
+
+        if self._db is None:
+            return None
+
+        try:
+            row = await anyio.to_thread.run_sync(self._disk_get, key, now)
+        except (sqlite3.Error, zlib.error) as e:
+            logger.warning("CurseForge disk cache read failed for %s: %s", key, e)
+            return None
+        if row is None:
+            return None
+        self._remember(key, *row)
+        return row[1]
+
+    async def set(self, key: str, body: bytes, ttl: int):
+        """Store a raw upstream body for ttl seconds"""
+        if ttl <= 0:
+            return
+
+        now = time.time()
+        expires_at = now + ttl
+        self._remember(key, expires_at, body)
+
+        if self._db is None:
+            return
+
+        try:
+            await anyio.to_thread.run_sync(self._disk_set, key, body, expires_at, now)
+        except sqlite3.Error as e:
+            # The memory tier still holds the entry; only persistence is skipped
+            logger.warning("CurseForge disk cache write failed for %s: %s", key, e)
+
+    def clear(self):
+        """Drop every entry from both tiers"""
+        self._memory.clear()
+        with self._db_lock:
+            if self._db is not None:
+                try:
+                    self._db.execute("DELETE FROM entries")
+                except sqlite3.Error as e:
+                    logger.warning("CurseForge disk cache clear failed: %s", e)
+
+    def _open_db(self):
+        """Create the SQLite tier, drop expired entries and warm the memory tier"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(
+            self.cache_dir / "curseforge.sqlite3",
+            timeout=DB_BUSY_TIMEOUT_SECONDS,
+            check_same_thread=False,
+            isolation_level=None
+        )
+        # Assigned first so close() releases the connection if setup fails
+        self._db = db
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY,"
+            " expires_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " body BLOB NOT NULL)"
+        )
+        db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)")
+
+        with self._db_lock:
+            db.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+
+            # Warm with the most recently used entries first so they survive memory eviction
+            rows = db.execute(
+                "SELECT key, expires_at, body FROM entries ORDER BY accessed_at DESC LIMIT ?",
+                (self.memory_entries,)
+            ).fetchall()
+            for key, expires_at, body in reversed(rows):
+                self._memory[key] = (expires_at, zlib.decompress(body))
+
+    def _disk_get(self, key: str, now: float) -> Optional[Tuple[float, bytes]]:
+        with self._db_lock:
+            if self._db is None:
+                return None
+            row = self._db.execute(
+                "SELECT expires_at, body FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[0] <= now:
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                return None
+            self._db.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+        return row[0], zlib.decompress(row[1])
+
+    def _disk_set(self, key: str, body: bytes, expires_at: float, now: float):
+        compressed = zlib.compress(body, 6)
+        if len(compressed) > self.max_bytes:
+            return
+        with self._db_lock:
+            if self._db is None:
+                return
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (key, expires_at, accessed_at, size, body) VALUES (?, ?, ?, ?, ?)",
+                (key, expires_at, now, len(compressed), compressed)
+            )
+            self._evict()
+
+    def _remember(self, key: str, expires_at: float, body: bytes):
+        self._memory[key] = (expires_at, body)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _stored_bytes(self) -> int:
+        return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def _evict(self):
+        """Drop expired entries, then least recently used ones, until under the size cap.
+
+        Sizes are summed from the database each time because other workers write to it too.
+        """
+        disk_bytes = self._stored_bytes()
+        if disk_bytes <= self.max_bytes:
+            return
+
+        self._db.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+        disk_bytes = self._stored_bytes()
+
+        while disk_bytes > self.max_bytes:
+            rows = self._db.execute(
+                "SELECT key, size FROM entries ORDER BY accessed_at ASC LIMIT 64"
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                disk_bytes -= size
+                if disk_bytes <= self.max_bytes:
+                    break
+
+# Global instance
+curseforge_cache = CurseForgeCache(
+    cache_dir=settings.CURSEFORGE_CACHE_DIR,
+    max_bytes=settings.CURSEFORGE_CACHE_MAX_BYTES,
+    memory_entries=settings.CURSEFORGE_CACHE_MEMORY_ENTRIES
+)
@@ -1,70 +1,70 @@
+import hashlib
 import json
-import os
 from typing import List, Dict, Optional
 from pathlib import Path
 
-from app.models.modpack import Modpack, Translations, AvailableLanguages
+from app.models.modpack import AvailableLanguages
 
 class DataLoader:
     """Service for loading and caching JSON data files"""
-    
+
     def __init__(self):
         self.data_dir = Path(__file__).parent.parent.parent / "data"
+        self.revision: Optional[str] = None
+        self._sources: Optional[Dict[str, bytes]] = None
         self._modpacks_cache: Optional[List[Dict]] = None
+        self._modpacks_by_id: Dict[str, Dict] = {}
         self._translations_cache: Dict[str, Dict] = {}
-        
+        self._languages: List[str] = []
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._modpacks_cache is not None
+
+    def load(self):
+        """Read and parse all data files and compute their revision.
+
+        Raises FileNotFoundError/ValueError if the data files are missing, are not
+        valid JSON or are not shaped like a catalogue. Field-level validation happens
+        when the prepared catalogue builds its responses.
+        """
+        self._apply(self._read_sources())
+
+    def ensure_loaded(self):
+        """Make the parsed data available, re-parsing the loaded revision after release()"""
+        if self.is_loaded:
+            return
+        if self._sources is not None:
+            self._apply(self._sources)
+        else:
+            self.load()
+
     def get_modpacks(self) -> List[Dict]:
-        """Load modpacks data from JSON file"""
-        if self._modpacks_cache is None:
-            modpacks_file = self.data_dir / "modpacks.json"
-            try:
-                with open(modpacks_file, 'r', encoding='utf-8') as f:
-                    self._modpacks_cache = json.load(f)
-            except FileNotFoundError:
-                raise FileNotFoundError(f"Modpacks data file not found: {modpacks_file}")
-            except json.JSONDecodeError as e:
-                raise ValueError(f"Invalid JSON in modpacks file: {e}")
-        
-        if self._modpacks_cache is None:
-            # This should not happen, but just in case, return an empty list or raise an error
-            return []
+        """Get all modpacks"""
+        self.ensure_loaded()
         return self._modpacks_cache
-    
+
     def get_modpack_by_id(self, modpack_id: str) -> Optional[Dict]:
         """Get a specific modpack by ID"""
-        modpacks = self.get_modpacks()
-        return next((mp for mp in modpacks if mp["id"] == modpack_id), None)
-    
+        self.ensure_loaded()
+        return self._modpacks_by_id.get(modpack_id)
+
     def get_translations(self, language: str) -> Dict:
-        """Load translations for a specific language"""
+        """Get translations for a specific language"""
+        self.ensure_loaded()
         if language not in self._translations_cache:
             translations_file = self.data_dir / "translations" / f"{language}.json"
-            try:
-                with open(translations_file, 'r', encoding='utf-8') as f:
-                    self._translations_cache[language] = json.load(f)
-            except FileNotFoundError:
-                raise FileNotFoundError(f"Translation file not found: {translations_file}")
-            except json.JSONDecodeError as e:
-                raise ValueError(f"Invalid JSON in translation file: {e}")
-        
+            raise FileNotFoundError(f"Translation file not found: {translations_file}")
         return self._translations_cache[language]
-    
+
     def get_available_languages(self) -> AvailableLanguages:
         """Get list of available translation languages"""
-        translations_dir = self.data_dir / "translations"
-        try:
-            language_files = [f.stem for f in translations_dir.glob("*.json")]
-            return AvailableLanguages(
-                availableLanguages=sorted(language_files),
-                defaultLanguage="es"
-            )
-        except Exception as e:
-            # Fallback to known languages
-            return AvailableLanguages(
-                availableLanguages=["es", "en"],
-                defaultLanguage="es"
-            )
-    
+        self.ensure_loaded()
+        return AvailableLanguages(
+            availableLanguages=self._languages,
+            defaultLanguage="es"
+        )
+
     def get_modpack_features(self, modpack_id: str, language: str) -> Optional[List[Dict]]:
         """Get features for a specific modpack in a specific language"""
         try:
@@ -73,11 +73,91 @@ class DataLoader:
             return features
         except (FileNotFoundError, KeyError):
             return None
-    
+
+    def release(self):
+        """Drop the parsed data but keep the revision.
+
+        The raw bytes of the loaded files are kept, so later access re-parses the same
+        revision instead of picking up whatever data/ holds by then.
+        """
+        self._modpacks_cache = None
+        self._modpacks_by_id = {}
+        self._translations_cache = {}
+        self._languages = []
+
     def clear_cache(self):
         """Clear all cached data"""
-        self._modpacks_cache = None
-        self._translations_cache.clear()
+        self.revision = None
+        self._sources = None
+        self.release()
+
+    def _read_sources(self) -> Dict[str, bytes]:
+        """Read the raw bytes of every data file, keyed by path relative to data/"""
+        modpacks_file = self.data_dir / "modpacks.json"
+        try:
+            sources = {"modpacks.json": modpacks_file.read_bytes()}
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Modpacks data file not found: {modpacks_file}")
+
+        for translations_file in sorted((self.data_dir / "translations").glob("*.json")):
+            sources[f"translations/{translations_file.name}"] = translations_file.read_bytes()
+        return sources
+
+    def _apply(self, sources: Dict[str, bytes]):
+        catalogue = self._parse_sources(sources)
+        self._check_structure(catalogue)
+
+        self._modpacks_cache = catalogue["modpacks"]
+        self._modpacks_by_id = {mp["id"]: mp for mp in self._modpacks_cache}
+        self._translations_cache = catalogue["translations"]
+        self._languages = sorted(self._translations_cache)
+        self.revision = self._compute_revision(sources)
+        self._sources = sources
+
+    def _compute_revision(self, sources: Dict[str, bytes]) -> str:
+        digest = hashlib.sha256()
+        for name in sorted(sources):
+            digest.update(b"\0" + name.encode() + b"\0")
+            digest.update(sources[name])
+        return digest.hexdigest()[:16]
+
+    def _parse_sources(self, sources: Dict[str, bytes]) -> Dict:
+        try:
+            modpacks = json.loads(sources["modpacks.json"])
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON in modpacks file: {e}")
+
+        translations = {}
+        for name, raw in sources.items():
+            if not name.startswith("translations/"):
+                continue
+            try:
+                translations[Path(name).stem] = json.loads(raw)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON in translation file {name}: {e}")
+
+        return {"modpacks": modpacks, "translations": translations}
+
+    def _check_structure(self, catalogue: Dict):
+        """Reject data that is not a list of uniquely identified modpack objects"""
+        modpacks = catalogue["modpacks"]
+        if not isinstance(modpacks, list):
+            raise ValueError("Invalid modpacks file: expected a list of modpacks")
+
+        seen_ids = set()
+        for position, modpack_data in enumerate(modpacks):
+            if not isinstance(modpack_data, dict):
+                raise ValueError(f"Invalid modpacks file: entry {position} is not an object")
+            modpack_id = modpack_data.get("id")
+            if not isinstance(modpack_id, str):
+                raise ValueError(f"Invalid modpacks file: entry {position} has no string 'id'")
+            if modpack_id in seen_ids:
+                raise ValueError(f"Duplicate modpack ID '{modpack_id}' in modpacks file")
+            seen_ids.add(modpack_id)
+
+        for language, translations in catalogue["translations"].items():
+            if not isinstance(translations, dict):
+                raise ValueError(f"Invalid translation file for '{language}': expected an object")
 
 # Global instance
-data_loader = DataLoader()
\ No newline at end of file
+data_loader = DataLoader()
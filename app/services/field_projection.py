@@ -0,0 +1,112 @@
+import json
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
+
+from app.config import settings
+from app.models.modpack import Modpack
+from app.services.prepared_catalogue import PreparedCatalogue, prepared_catalogue, modpacks_key, modpack_key
+
+MODPACK_FIELDS: Tuple[str, ...] = tuple(Modpack.model_fields)
+
+# Fields the /modpacks list links as image variants; they are copied from the
+# prepared list body, whose links were built from the raw catalogue URLs
+LIST_IMAGE_FIELDS: Tuple[str, ...] = ("logo", "backgroundImage")
+
+@lru_cache(maxsize=256)
+def compile_fields(fields: str) -> Tuple[str, ...]:
+    """Turn a ``fields=`` value into a canonical projection (model field order).
+
+    Raises ValueError for empty or unknown field names.
+    """
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    if not requested:
+        raise ValueError("No fields requested")
+    unknown = requested.difference(MODPACK_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(name for name in MODPACK_FIELDS if name in requested)
+
+class ProjectionCache:
+    """Serialized sparse-fieldset responses, cached per revision, language and field set.
+
+    Projections are taken from the full prepared modpack bodies, so any ``Modpack``
+    attribute can be requested from either endpoint. On the list endpoint, ``logo``
+    and ``backgroundImage`` link the same image variants as the unprojected list.
+    Methods return None when the language or modpack is not in the current revision.
+    """
+
+    def __init__(self, catalogue: PreparedCatalogue, max_entries: int = 256):
+        self.catalogue = catalogue
+        self.max_entries = max_entries
+        self._revision: Optional[str] = None
+        self._bodies: "OrderedDict[Tuple, bytes]" = OrderedDict()
+
+    def modpacks(self, lang: str, fields: str) -> Optional[bytes]:
+        """Projected /modpacks body: count, projected modpacks and UI translations"""
+        projection = compile_fields(fields)
+        return self._cached((lang, projection, None), lambda: self._build_modpacks(lang, projection))
+
+    def modpack(self, lang: str, modpack_id: str, fields: str) -> Optional[bytes]:
+        """Projected /modpacks/{id} body"""
+        projection = compile_fields(fields)
+        return self._cached((lang, projection, modpack_id), lambda: self._build_modpack(lang, modpack_id, projection))
+
+    def _cached(self, key: Tuple, build: Callable[[], Optional[bytes]]) -> Optional[bytes]:
+        revision = self.catalogue.revision
+        if revision != self._revision:
+            # Projections of an older revision can never be served again
+            self._bodies.clear()
+            self._revision = revision
+
+        body = self._bodies.get(key)
+        if body is not None:
+            self._bodies.move_to_end(key)
+            return body
+
+        body = build()
+        if body is None:
+            return None
+        self._bodies[key] = body
+        while len(self._bodies) > self.max_entries:
+            self._bodies.popitem(last=False)
+        return body
+
+    def _build_modpacks(self, lang: str, projection: Tuple[str, ...]) -> Optional[bytes]:
+        listing = self.catalogue.get(modpacks_key(lang))
+        if listing is None:
+            return None
+        listing = json.loads(listing)
+        listed_images = {
+            modpack["id"]: {name: modpack[name] for name in LIST_IMAGE_FIELDS}
+            for modpack in listing["modpacks"]
+        }
+        modpacks = []
+        for modpack_id in self.catalogue.modpack_ids():
+            projected = self._project(lang, modpack_id, projection)
+            if projected is None or modpack_id not in listed_images:
+                # The catalogue switched revisions mid-build; serve what this one has
+                continue
+            for name in LIST_IMAGE_FIELDS:
+                if name in projected:
+                    projected[name] = listed_images[modpack_id][name]
+            modpacks.append(projected)
+        return self._dump({"count": len(modpacks), "modpacks": modpacks, "ui": listing["ui"]})
+
+    def _build_modpack(self, lang: str, modpack_id: str, projection: Tuple[str, ...]) -> Optional[bytes]:
+        projected = self._project(lang, modpack_id, projection)
+        return self._dump(projected) if projected is not None else None
+
+    def _project(self, lang: str, modpack_id: str, projection: Tuple[str, ...]) -> Optional[Dict]:
+        body = self.catalogue.get(modpack_key(lang, modpack_id))
+        if body is None:
+            return None
+        full = json.loads(body)
+        return {name: full[name] for name in projection}
+
+    @staticmethod
+    def _dump(content: Dict) -> bytes:
+        return json.dumps(content, separators=(",", ":"), ensure_ascii=False).encode()
+
+# Global instance
+modpack_projections = ProjectionCache(prepared_catalogue, max_entries=settings.PROJECTION_CACHE_ENTRIES)
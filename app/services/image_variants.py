@@ -0,0 +1,218 @@
+import asyncio
+import hashlib
+import io
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import anyio
+import httpx
+from PIL import Image
+
+from app.config import settings
+
+# Maximum width of each variant; height follows the source aspect ratio
+VARIANTS: Dict[str, int] = {
+    "thumbnail": 160,
+    "card": 480,
+    "full": 1280,
+}
+
+# How long a source that failed to load is answered with an error before it is fetched again
+FAILURE_RETRY_SECONDS = 60.0
+
+class ImageSourceError(Exception):
+    """The source image could not be fetched or decoded"""
+
+class ImageVariants:
+    """Resized WebP variants of catalogue images, kept in a size-capped disk LRU.
+
+    Only URLs that appear in the catalogue can be requested, addressed by a short
+    hash of the URL, so the endpoint cannot be used as an open proxy.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = 512 * 1024 * 1024,
+                 public_base_url: Optional[str] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_bytes = max_bytes
+        self.public_base_url = public_base_url.rstrip("/") if public_base_url else None
+        self._sources: Dict[str, str] = {}
+        self._etags: Dict[str, str] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._failures: Dict[str, float] = {}
+        self._disk_bytes = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.cache_dir is not None
+
+    @property
+    def linkable(self) -> bool:
+        """Whether responses can link variants (needs the public base URL)"""
+        return self.enabled and self.public_base_url is not None
+
+    def open(self):
+        """Create the cache directory and measure what is already cached"""
+        if not self.enabled:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._disk_bytes = sum(f.stat().st_size for f in self.cache_dir.glob("*.webp"))
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        return hashlib.sha256(url.encode()).hexdigest()[:20]
+
+    def sources_for(self, modpacks_data: List[Dict]) -> Dict[str, str]:
+        """Map of image key -> source URL for every image referenced by the catalogue"""
+        return {self.key_for(url): url for url in self._image_urls(modpacks_data)}
+
+    def set_sources(self, sources: Dict[str, str]):
+        """Allow exactly these images to be served (called whenever the catalogue revision changes)"""
+        self._sources = dict(sources)
+        self._failures = {key: retry_at for key, retry_at in self._failures.items() if key in self._sources}
+
+    def url_for(self, source_url: str, variant: str) -> str:
+        """Public URL of a variant, or the source URL when variants cannot be linked"""
+        if not self.linkable:
+            return source_url
+        return f"{self.public_base_url}/v1/images/{self.key_for(source_url)}/{variant}"
+
+    def links_for(self, source_url: str) -> Dict[str, str]:
+        """Public URLs of every variant of an image"""
+        return {variant: self.url_for(source_url, variant) for variant in VARIANTS}
+
+    async def get(self, key: str, variant: str) -> Optional[Tuple[bytes, str]]:
+        """Return (WebP bytes, strong ETag) for a variant, rendering it on first use.
+
+        Raises ImageSourceError if the source cannot be loaded; the failure is
+        remembered for FAILURE_RETRY_SECONDS so the origin is not hit on every request.
+        """
+        if variant not in VARIANTS or key not in self._sources:
+            return None
+
+        path = self._variant_path(key, variant)
+        cached = self._read(path)
+        if cached is not None:
+            return cached
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                # Another request may have rendered it while we waited
+                cached = self._read(path)
+                if cached is not None:
+                    return cached
+
+                if self._failures.get(key, 0.0) > time.monotonic():
+                    raise ImageSourceError(f"Source image {key} failed to load recently")
+                try:
+                    rendered = await self._fetch_and_render(self._sources[key])
+                except (httpx.HTTPError, OSError, ValueError, Image.DecompressionBombError) as e:
+                    self._failures[key] = time.monotonic() + FAILURE_RETRY_SECONDS
+                    raise ImageSourceError(f"Failed to load source image {key}: {e}") from e
+                self._failures.pop(key, None)
+
+                for name, body in rendered.items():
+                    self._write(self._variant_path(key, name), body)
+                self._evict()
+        finally:
+            self._locks.pop(key, None)
+
+        # Eviction may already have removed this variant from disk; serve it from memory
+        body = rendered[variant]
+        return body, self._etag(body)
+
+    async def _fetch_and_render(self, source_url: str) -> Dict[str, bytes]:
+        async with httpx.AsyncClient(follow_redirects=True) as client:
+            response = await client.get(source_url, timeout=15.0)
+            response.raise_for_status()
+
+        # Render every size from a single fetch of the source
+        return await anyio.to_thread.run_sync(self._render, response.content)
+
+    @staticmethod
+    def _image_urls(modpacks_data: List[Dict]) -> Iterable[str]:
+        for modpack_data in modpacks_data:
+            for url in (modpack_data.get("logo"), modpack_data.get("backgroundImage")):
+                if url:
+                    yield url
+            yield from modpack_data.get("images", [])
+            for collaborator in modpack_data.get("collaborators", []):
+                if collaborator.get("logo"):
+                    yield collaborator["logo"]
+
+    @staticmethod
+    def _render(source: bytes) -> Dict[str, bytes]:
+        with Image.open(io.BytesIO(source)) as image:
+            image.load()
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA")
+            rendered = {}
+            for name, max_width in VARIANTS.items():
+                variant = image
+                if image.width > max_width:
+                    height = max(1, round(image.height * max_width / image.width))
+                    variant = image.resize((max_width, height), Image.Resampling.LANCZOS)
+                out = io.BytesIO()
+                variant.save(out, format="WEBP", quality=80, method=4)
+                rendered[name] = out.getvalue()
+            return rendered
+
+    @staticmethod
+    def _etag(body: bytes) -> str:
+        return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+    def _variant_path(self, key: str, variant: str) -> Path:
+        return self.cache_dir / f"{key}-{variant}.webp"
+
+    def _read(self, path: Path) -> Optional[Tuple[bytes, str]]:
+        try:
+            body = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        # Touch so eviction sees recently served variants as fresh
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        etag = self._etags.get(path.name)
+        if etag is None:
+            etag = self._etags[path.name] = self._etag(body)
+        return body, etag
+
+    def _write(self, path: Path, body: bytes):
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(body)
+        os.replace(tmp_path, path)
+        self._etags[path.name] = self._etag(body)
+        self._disk_bytes += len(body)
+
+    def _evict(self):
+        """Delete least recently served variants until the cache is under its cap"""
+        if self._disk_bytes <= self.max_bytes:
+            return
+        entries = []
+        for path in self.cache_dir.glob("*.webp"):
+            try:
+                stat_result = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat_result.st_mtime, stat_result.st_size, path))
+        self._disk_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if self._disk_bytes <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            self._etags.pop(path.name, None)
+            self._disk_bytes -= size
+
+# Global instance
+image_variants = ImageVariants(
+    cache_dir=settings.IMAGE_CACHE_DIR,
+    max_bytes=settings.IMAGE_CACHE_MAX_BYTES,
+    public_base_url=settings.PUBLIC_BASE_URL
+)
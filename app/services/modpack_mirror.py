@@ -0,0 +1,339 @@
+import asyncio
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from email.utils import formatdate
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+import anyio
+import httpx
+from starlette.responses import FileResponse
+from starlette.types import Receive, Scope, Send
+
+from app.config import settings
+
+logger = logging.getLogger("uvicorn.error")
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+class ModpackMirror:
+    """Content-addressed local mirror of the modpack zips referenced in modpacks.json.
+
+    Files are stored as ``objects/<sha[:2]>/<sha256>`` and described by ``index.json``,
+    which maps each source URL to its hash, size and origin validators. Only one
+    process syncs at a time (``flock`` on ``.lock``); the others poll the index every
+    ``poll_interval`` seconds and also reload it when asked for a zip they do not know.
+    """
+
+    def __init__(self, mirror_dir: Optional[str] = None, sync_interval: int = 3600,
+                 poll_interval: float = 10.0):
+        self.mirror_dir = Path(mirror_dir) if mirror_dir else None
+        self.sync_interval = sync_interval
+        self.poll_interval = poll_interval
+        self._files: Dict[str, Dict] = {}
+        self._modpacks: Dict[str, str] = {}
+        self._last_miss_reload = 0.0
+        self.revision: Optional[str] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.mirror_dir is not None
+
+    def open(self):
+        """Create the mirror layout and load the current index"""
+        if not self.enabled:
+            return
+        (self.mirror_dir / "objects").mkdir(parents=True, exist_ok=True)
+        (self.mirror_dir / "tmp").mkdir(exist_ok=True)
+        self.reload()
+
+    def reload(self) -> bool:
+        """Re-read index.json; returns True if the mirrored set changed"""
+        files, modpacks = self._read_index()
+        revision = None
+        if modpacks:
+            described = {mp_id: files[url]["sha256"] for mp_id, url in modpacks.items()}
+            revision = hashlib.sha256(json.dumps(described, sort_keys=True).encode()).hexdigest()[:12]
+
+        changed = revision != self.revision
+        self._files, self._modpacks, self.revision = files, modpacks, revision
+        return changed
+
+    def describe(self, modpack_id: str) -> Optional[Dict]:
+        """Size and hash of a mirrored zip, or None if it is not mirrored yet"""
+        url = self._modpacks.get(modpack_id)
+        return self._files.get(url) if url else None
+
+    def annotate(self, modpacks_data: List[Dict]) -> List[Dict]:
+        """Return modpacks with size, SHA-256 and mirror path added for mirrored zips"""
+        annotated = []
+        for modpack_data in modpacks_data:
+            info = self.describe(modpack_data["id"])
+            if info is None or info["url"] != modpack_data.get("urlModpackZip"):
+                annotated.append(modpack_data)
+                continue
+            annotated.append({
+                **modpack_data,
+                "modpackZipSize": info["size"],
+                "modpackZipSha256": info["sha256"],
+                "modpackZipMirror": f"/v1/modpacks/{modpack_data['id']}/download",
+            })
+        return annotated
+
+    def file_response(self, modpack_id: str, method: str, range_header: Optional[str],
+                      if_range: Optional[str]) -> Optional[FileResponse]:
+        """Build the (possibly partial) response for a mirrored zip"""
+        info = self.describe(modpack_id)
+        if info is None and self.enabled:
+            # Another worker may have mirrored it (and published a catalogue advertising it)
+            # before our next poll; re-read the index, at most once per second
+            now = time.monotonic()
+            if now - self._last_miss_reload >= 1.0:
+                self._last_miss_reload = now
+                self.reload()
+                info = self.describe(modpack_id)
+        if info is None:
+            return None
+        return RangeFileResponse(
+            self._object_path(info["sha256"]),
+            info,
+            range_header=range_header,
+            if_range=if_range,
+            method=method
+        )
+
+    async def run(self, targets: Dict[str, str], on_change: Callable[[], None]):
+        """Sync every sync_interval, poll the index every poll_interval, and call
+        on_change whenever the mirrored set differs from the one last announced"""
+        announced = self.revision
+        next_sync = 0.0
+        while True:
+            if time.monotonic() >= next_sync:
+                try:
+                    await self.sync(targets)
+                except Exception:
+                    logger.exception("Modpack mirror sync failed")
+                next_sync = time.monotonic() + self.sync_interval
+            self.reload()
+            if self.revision != announced:
+                announced = self.revision
+                try:
+                    on_change()
+                except Exception:
+                    logger.exception("Failed to apply modpack mirror change")
+            await asyncio.sleep(min(self.poll_interval, self.sync_interval))
+
+    async def sync(self, targets: Dict[str, str]) -> bool:
+        """Mirror every target zip (modpack ID -> URL). Returns False if another process holds the lock."""
+        lock_file = open(self.mirror_dir / ".lock", "w")
+        try:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return False
+
+            files, _ = self._read_index()
+            async with httpx.AsyncClient(follow_redirects=True) as client:
+                for modpack_id, url in targets.items():
+                    try:
+                        info = await self._fetch(client, url, files.get(url))
+                    except (httpx.HTTPError, OSError) as e:
+                        logger.warning("Failed to mirror %s: %s", url, e)
+                        continue
+                    if info is not None:
+                        files[url] = info
+
+            files = {url: info for url, info in files.items() if url in targets.values()}
+            self._write_index({
+                "files": files,
+                "modpacks": {mp_id: url for mp_id, url in targets.items() if url in files},
+            })
+            self._collect_garbage({info["sha256"] for info in files.values()})
+            return True
+        finally:
+            lock_file.close()
+
+    async def _fetch(self, client: httpx.AsyncClient, url: str, current: Optional[Dict]) -> Optional[Dict]:
+        """Download url into the object store; returns None if the origin reports it unchanged"""
+        headers = {}
+        if current and self._object_path(current["sha256"]).is_file():
+            if current.get("etag"):
+                headers["If-None-Match"] = current["etag"]
+            if current.get("lastModified"):
+                headers["If-Modified-Since"] = current["lastModified"]
+
+        tmp_path = self.mirror_dir / "tmp" / f"{os.getpid()}-{hashlib.sha1(url.encode()).hexdigest()}"
+        try:
+            async with client.stream("GET", url, headers=headers, timeout=httpx.Timeout(30.0, read=120.0)) as response:
+                if response.status_code == 304:
+                    return None
+                response.raise_for_status()
+
+                digest = hashlib.sha256()
+                size = 0
+                # Hashing and disk writes run in a worker thread to keep the event loop free
+                async with await anyio.open_file(tmp_path, "wb") as f:
+                    async for chunk in response.aiter_bytes(1024 * 1024):
+                        await anyio.to_thread.run_sync(digest.update, chunk)
+                        await f.write(chunk)
+                        size += len(chunk)
+
+            sha256 = digest.hexdigest()
+            object_path = self._object_path(sha256)
+            object_path.parent.mkdir(exist_ok=True)
+            os.replace(tmp_path, object_path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+        logger.info("Mirrored %s (%d bytes, sha256 %s)", url, size, sha256)
+        return {
+            "url": url,
+            "sha256": sha256,
+            "size": size,
+            "filename": unquote(Path(urlparse(url).path).name).replace('"', "") or f"{sha256}.zip",
+            "etag": response.headers.get("etag"),
+            "lastModified": response.headers.get("last-modified"),
+        }
+
+    def _read_index(self) -> Tuple[Dict[str, Dict], Dict[str, str]]:
+        """Load index.json, keeping only entries whose object file exists"""
+        try:
+            with open(self.mirror_dir / "index.json", 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            index = {"files": {}, "modpacks": {}}
+
+        files = {
+            url: info for url, info in index.get("files", {}).items()
+            if self._object_path(info["sha256"]).is_file()
+        }
+        modpacks = {mp_id: url for mp_id, url in index.get("modpacks", {}).items() if url in files}
+        return files, modpacks
+
+    def _object_path(self, sha256: str) -> Path:
+        return self.mirror_dir / "objects" / sha256[:2] / sha256
+
+    def _write_index(self, index: Dict):
+        tmp_path = self.mirror_dir / f"index.json.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, indent=2)
+        os.replace(tmp_path, self.mirror_dir / "index.json")
+
+    def _collect_garbage(self, keep: set):
+        for object_path in (self.mirror_dir / "objects").glob("*/*"):
+            if object_path.name not in keep:
+                try:
+                    object_path.unlink()
+                except OSError:
+                    pass
+
+class RangeFileResponse(FileResponse):
+    """FileResponse with single-range support (Range / If-Range) and a strong SHA-256 ETag"""
+
+    chunk_size = 1024 * 1024
+
+    def __init__(self, path: Path, info: Dict, range_header: Optional[str] = None,
+                 if_range: Optional[str] = None, method: Optional[str] = None):
+        size = info["size"]
+        etag = f'"{info["sha256"]}"'
+        headers = {
+            "accept-ranges": "bytes",
+            "etag": etag,
+            "cache-control": "public, max-age=3600",
+            # Keeps GZipMiddleware from re-encoding the zip, which would break ranges
+            "content-encoding": "identity",
+        }
+        if info.get("lastModified"):
+            headers["last-modified"] = info["lastModified"]
+
+        self.start, self.end = 0, size - 1
+        status_code = 200
+        byte_range = None
+        if range_header and (if_range is None or if_range.strip() == etag):
+            byte_range = self._parse_range(range_header, size)
+        if byte_range == "unsatisfiable":
+            status_code = 416
+            headers["content-range"] = f"bytes */{size}"
+            headers["content-length"] = "0"
+        elif byte_range is not None:
+            status_code = 206
+            self.start, self.end = byte_range
+            headers["content-range"] = f"bytes {self.start}-{self.end}/{size}"
+        if status_code != 416:
+            headers["content-length"] = str(self.end - self.start + 1)
+
+        super().__init__(
+            path,
+            status_code=status_code,
+            headers=headers,
+            media_type="application/zip",
+            filename=info["filename"],
+            method=method,
+            stat_result=os.stat(path)
+        )
+
+    def set_stat_headers(self, stat_result: os.stat_result) -> None:
+        # Length, ETag and Last-Modified come from the mirror index, not the object file
+        self.headers.setdefault("last-modified", formatdate(stat_result.st_mtime, usegmt=True))
+
+    @staticmethod
+    def _parse_range(range_header: str, size: int):
+        """Parse a single byte range; multiple ranges are ignored and the full file is served"""
+        match = RANGE_PATTERN.match(range_header.strip())
+        if not match:
+            return None
+        first, last = match.groups()
+        if not first and not last:
+            return None
+        if not first:
+            # Suffix range: the last N bytes
+            length = int(last)
+            if length == 0:
+                return "unsatisfiable"
+            return max(size - length, 0), size - 1
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if start >= size or end < start:
+            return "unsatisfiable"
+        return start, end
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers,
+        })
+        if self.send_header_only or self.status_code == 416:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(self.start)
+            remaining = self.end - self.start + 1
+            while remaining > 0:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({
+                    "type": "http.response.body",
+                    "body": chunk,
+                    "more_body": remaining > 0,
+                })
+        if remaining > 0:
+            # File shrank underneath us; close the body so the client sees a short read
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+# Global instance
+modpack_mirror = ModpackMirror(
+    mirror_dir=settings.MODPACK_MIRROR_DIR,
+    sync_interval=settings.MODPACK_MIRROR_SYNC_SECONDS,
+    poll_interval=settings.MODPACK_MIRROR_POLL_SECONDS
+)
@@ -0,0 +1,333 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pydantic
+
+from app.config import settings
+from app.models.modpack import Translations
+from app.services.catalogue import build_modpacks_response, build_modpacks_list, build_modpack
+from app.services.data_loader import DataLoader, data_loader
+from app.services.image_variants import image_variants
+from app.services.modpack_mirror import modpack_mirror
+
+# File layout: magic, index length, JSON index, then the concatenated response bodies.
+# Index offsets are relative to the start of the bodies.
+CATALOGUE_MAGIC = b"LKCAT002"
+HEADER = struct.Struct("<8sI")
+POINTER_FILE = "current"
+
+# Modules whose code shapes the prepared bodies: models, builders, data parsing,
+# mirror annotations, image links and this module's build_bodies
+BUILD_SOURCES = (
+    "models/modpack.py",
+    "services/catalogue.py",
+    "services/data_loader.py",
+    "services/image_variants.py",
+    "services/modpack_mirror.py",
+    "services/prepared_catalogue.py",
+)
+
+def _build_fingerprint() -> str:
+    """Hash of everything besides the data that shapes the bodies, so code changes invalidate them"""
+    app_dir = Path(__file__).parent.parent
+    digest = hashlib.sha256(CATALOGUE_MAGIC + pydantic.VERSION.encode())
+    for source in BUILD_SOURCES:
+        digest.update(b"\0" + source.encode() + b"\0")
+        digest.update((app_dir / source).read_bytes())
+    return digest.hexdigest()
+
+BUILD_FINGERPRINT = _build_fingerprint()
+
+def modpacks_key(lang: str) -> str:
+    return f"modpacks:{lang}"
+
+def modpack_key(lang: str, modpack_id: str) -> str:
+    return f"modpack:{lang}:{modpack_id}"
+
+LIST_KEY = "list"
+
+def catalogue_revision(loader: DataLoader) -> str:
+    """Revision of the served catalogue: data files, mirrored zips, image links and build code"""
+    image_links = image_variants.public_base_url if image_variants.enabled else None
+    digest = hashlib.sha256(BUILD_FINGERPRINT.encode())
+    for part in (loader.revision, modpack_mirror.revision, image_links):
+        digest.update(b"\0" + (part or "").encode())
+    return f"{loader.revision}-{digest.hexdigest()[:8]}"
+
+def build_bodies(loader: DataLoader) -> Dict[str, bytes]:
+    """Serialize every catalogue response once, for every language.
+
+    This is the single validation pass over the data: any field that does not fit
+    the response models raises ValueError.
+    """
+    modpacks_data = modpack_mirror.annotate(loader.get_modpacks())
+    image_links = image_variants.links_for if image_variants.linkable else None
+    try:
+        bodies = {LIST_KEY: build_modpacks_list(modpacks_data).model_dump_json().encode()}
+        for lang in loader.get_available_languages().availableLanguages:
+            translations = loader.get_translations(lang)
+            Translations(**translations)
+            bodies[modpacks_key(lang)] = build_modpacks_response(
+                modpacks_data, translations, image_url=image_variants.url_for
+            ).model_dump_json().encode()
+            for modpack_data in modpacks_data:
+                bodies[modpack_key(lang, modpack_data["id"])] = build_modpack(
+                    modpack_data, translations, image_links=image_links
+                ).model_dump_json().encode()
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid catalogue data: {e}")
+    return bodies
+
+class _Snapshot:
+    """One immutable revision of the prepared catalogue"""
+
+    def __init__(self, revision: str, index: Dict[str, Tuple[int, int]], languages: List[str],
+                 modpack_ids: List[str], image_sources: Dict[str, str], buffer, base: int = 0,
+                 mapping: Optional[mmap.mmap] = None):
+        self.revision = revision
+        self.index = index
+        self.languages = set(languages)
+        self.ordered_modpack_ids = list(modpack_ids)
+        self.modpack_ids = set(modpack_ids)
+        self.image_sources = image_sources
+        self.buffer = buffer
+        self.base = base
+        self.mapping = mapping
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self.index.get(key)
+        if entry is None:
+            return None
+        start = self.base + entry[0]
+        return self.buffer[start:start + entry[1]]
+
+    def close(self):
+        if self.mapping is not None:
+            self.mapping.close()
+
+class PreparedCatalogue:
+    """Pre-serialized catalogue responses, stored in a catalogue file and memory-mapped.
+
+    Without a shared directory, the file is the precompiled cache next to data/ and is
+    reused on the next start while the revision matches. With one, each revision is
+    written once to ``catalogue-<revision>.bin``, every worker maps it, and workers
+    switch to a new revision when the ``current`` pointer file changes.
+    """
+
+    def __init__(self, shared_dir: Optional[str] = None, check_interval: float = 5.0,
+                 cache_file: Optional[str] = None):
+        self.shared_dir = Path(shared_dir) if shared_dir else None
+        self.check_interval = check_interval
+        self.cache_file = Path(cache_file) if cache_file else Path(__file__).parent.parent.parent / ".catalogue.cache"
+        self._snapshot: Optional[_Snapshot] = None
+        self._last_check = 0.0
+
+    @property
+    def revision(self) -> Optional[str]:
+        snapshot = self._current()
+        return snapshot.revision if snapshot else None
+
+    def prepare(self, loader: DataLoader = data_loader) -> bool:
+        """Serve the catalogue for the loader's data, building it only if no file matches.
+
+        Returns True when an existing catalogue file was reused.
+        """
+        # Rebuilds (e.g. after a mirror change) re-parse the revision loaded at startup
+        loader.ensure_loaded()
+        revision = catalogue_revision(loader)
+        path = self._catalogue_path(revision)
+
+        snapshot = None
+        try:
+            snapshot = self._map(path)
+            if snapshot.revision != revision:
+                snapshot.close()
+                snapshot = None
+        except (OSError, ValueError, KeyError):
+            pass
+        from_cache = snapshot is not None
+
+        if snapshot is None:
+            bodies = build_bodies(loader)
+            languages = loader.get_available_languages().availableLanguages
+            modpack_ids = [mp["id"] for mp in loader.get_modpacks()]
+            image_sources = image_variants.sources_for(loader.get_modpacks())
+            try:
+                self._write_catalogue(path, revision, bodies, languages, modpack_ids, image_sources)
+                snapshot = self._map(path)
+            except OSError:
+                if self.shared_dir is not None:
+                    raise
+                # Read-only filesystem: serve from memory and rebuild on the next start
+                index, buffer = self._pack(bodies)
+                snapshot = _Snapshot(revision, index, languages, modpack_ids, image_sources, buffer)
+
+        if self.shared_dir is not None:
+            self._point(revision)
+        self._swap(snapshot)
+        # Responses are served from the catalogue, so the parsed copy is no longer needed
+        loader.release()
+        return from_cache
+
+    def publish(self, revision: str, bodies: Dict[str, bytes], languages: List[str], modpack_ids: List[str],
+                image_sources: Dict[str, str]):
+        """Write a revision file (if missing) and point ``current`` at it atomically"""
+        path = self._catalogue_path(revision)
+        if not path.exists():
+            self._write_catalogue(path, revision, bodies, languages, modpack_ids, image_sources)
+        self._point(revision)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return a prepared response body, or None if the key does not exist"""
+        snapshot = self._current()
+        return snapshot.get(key) if snapshot else None
+
+    def has_language(self, lang: str) -> bool:
+        snapshot = self._current()
+        return snapshot is not None and lang in snapshot.languages
+
+    def has_modpack(self, modpack_id: str) -> bool:
+        snapshot = self._current()
+        return snapshot is not None and modpack_id in snapshot.modpack_ids
+
+    def modpack_ids(self) -> List[str]:
+        """Modpack IDs in catalogue order"""
+        snapshot = self._current()
+        return snapshot.ordered_modpack_ids if snapshot else []
+
+    def close(self):
+        if self._snapshot is not None:
+            self._snapshot.close()
+            self._snapshot = None
+
+    def _catalogue_path(self, revision: str) -> Path:
+        if self.shared_dir is None:
+            return self.cache_file
+        return self.shared_dir / f"catalogue-{revision}.bin"
+
+    def _current(self) -> Optional[_Snapshot]:
+        if self.shared_dir is not None and self._snapshot is not None:
+            now = time.monotonic()
+            if now - self._last_check >= self.check_interval:
+                self._last_check = now
+                self._refresh()
+        return self._snapshot
+
+    def _refresh(self):
+        """Switch to the revision named by the pointer file if it changed"""
+        try:
+            revision = (self.shared_dir / POINTER_FILE).read_text().strip()
+        except OSError:
+            return
+        if revision and revision != self._snapshot.revision:
+            try:
+                self._swap(self._map(self._catalogue_path(revision)))
+            except (OSError, ValueError, KeyError):
+                # Pointer flipped to a file that is gone or incomplete; keep serving the current one
+                pass
+
+    def _swap(self, snapshot: _Snapshot):
+        previous, self._snapshot = self._snapshot, snapshot
+        self._last_check = time.monotonic()
+        # The image endpoint may only serve images of the revision being served
+        image_variants.set_sources(snapshot.image_sources)
+        if previous is not None and previous is not snapshot:
+            # Slices of an mmap are copies, so closing it cannot affect responses in flight
+            previous.close()
+
+    def _point(self, revision: str):
+        """Flip ``current`` to a revision and remove the other revision files"""
+        self._write_atomic(self.shared_dir / POINTER_FILE, revision.encode())
+        target = self._catalogue_path(revision)
+        for stale in self.shared_dir.glob("catalogue-*.bin"):
+            if stale != target:
+                try:
+                    stale.unlink()
+                except OSError:
+                    pass
+
+    def _write_catalogue(self, path: Path, revision: str, bodies: Dict[str, bytes], languages: List[str],
+                         modpack_ids: List[str], image_sources: Dict[str, str]):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        index, buffer = self._pack(bodies)
+        header_index = json.dumps({
+            "revision": revision,
+            "languages": languages,
+            "modpackIds": modpack_ids,
+            "images": image_sources,
+            "entries": index,
+        }).encode()
+        self._write_atomic(path, HEADER.pack(CATALOGUE_MAGIC, len(header_index)) + header_index + buffer)
+
+    def _map(self, path: Path) -> _Snapshot:
+        with open(path, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(mapping) < HEADER.size:
+            mapping.close()
+            raise ValueError(f"Truncated catalogue file {path}")
+        magic, index_length = HEADER.unpack_from(mapping, 0)
+        if magic != CATALOGUE_MAGIC:
+            mapping.close()
+            raise ValueError(f"Invalid catalogue file {path}")
+        index = json.loads(mapping[HEADER.size:HEADER.size + index_length])
+        return _Snapshot(
+            index["revision"],
+            {key: tuple(entry) for key, entry in index["entries"].items()},
+            index["languages"],
+            index["modpackIds"],
+            index["images"],
+            mapping,
+            base=HEADER.size + index_length,
+            mapping=mapping
+        )
+
+    @staticmethod
+    def _pack(bodies: Dict[str, bytes]) -> Tuple[Dict[str, Tuple[int, int]], bytes]:
+        index = {}
+        offset = 0
+        for key, body in bodies.items():
+            index[key] = (offset, len(body))
+            offset += len(body)
+        return index, b"".join(bodies.values())
+
+    @staticmethod
+    def _write_atomic(path: Path, content: bytes):
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            raise
+
+# Global instance
+prepared_catalogue = PreparedCatalogue(
+    shared_dir=settings.SHARED_CATALOGUE_DIR,
+    check_interval=settings.SHARED_CATALOGUE_CHECK_SECONDS,
+    cache_file=settings.CATALOGUE_CACHE_FILE
+)
+
+if __name__ == "__main__":
+    # Publish the current data/ directory for running workers: python -m app.services.prepared_catalogue
+    if prepared_catalogue.shared_dir is None:
+        raise SystemExit("SHARED_CATALOGUE_DIR is not set")
+    data_loader.load()
+    modpack_mirror.open()
+    prepared_catalogue.publish(
+        catalogue_revision(data_loader),
+        build_bodies(data_loader),
+        data_loader.get_available_languages().availableLanguages,
+        [mp["id"] for mp in data_loader.get_modpacks()],
+        image_variants.sources_for(data_loader.get_modpacks())
+    )
+    print(f"Published catalogue revision {catalogue_revision(data_loader)} to {prepared_catalogue.shared_dir}")
@@ -0,0 +1,97 @@
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+import app.services.prepared_catalogue as prepared_module
+from app.services.data_loader import DataLoader
+from app.services.prepared_catalogue import PreparedCatalogue, LIST_KEY
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+@pytest.fixture
+def loader(tmp_path):
+    shutil.copytree(DATA_DIR, tmp_path / "data")
+    data_loader = DataLoader()
+    data_loader.data_dir = tmp_path / "data"
+    return data_loader
+
+def write_modpacks(loader, modpacks):
+    (loader.data_dir / "modpacks.json").write_text(json.dumps(modpacks))
+
+def test_non_object_entry_is_rejected(loader):
+    write_modpacks(loader, ["not-a-modpack"])
+    with pytest.raises(ValueError, match="entry 0 is not an object"):
+        loader.load()
+
+def test_invalid_field_fails_prepare(loader, tmp_path):
+    modpacks = json.loads((loader.data_dir / "modpacks.json").read_text())
+    modpacks[0]["version"] = {"not": "a string"}
+    write_modpacks(loader, modpacks)
+    loader.load()
+    with pytest.raises(ValueError, match="Invalid catalogue data"):
+        PreparedCatalogue(cache_file=str(tmp_path / "catalogue.cache")).prepare(loader)
+
+def test_second_start_reuses_prepared_catalogue(loader, tmp_path, monkeypatch):
+    cache_file = str(tmp_path / "catalogue.cache")
+    loader.load()
+    first = PreparedCatalogue(cache_file=cache_file)
+    assert first.prepare(loader) is False
+    body = first.get(LIST_KEY)
+    first.close()
+
+    def build_bodies(loader):
+        raise AssertionError("catalogue was rebuilt")
+
+    monkeypatch.setattr(prepared_module, "build_bodies", build_bodies)
+    loader.load()
+    second = PreparedCatalogue(cache_file=cache_file)
+    assert second.prepare(loader) is True
+    assert second.get(LIST_KEY) == body
+    second.close()
+
+def test_changed_data_invalidates_prepared_catalogue(loader, tmp_path):
+    cache_file = str(tmp_path / "catalogue.cache")
+    loader.load()
+    first = PreparedCatalogue(cache_file=cache_file)
+    first.prepare(loader)
+    first.close()
+
+    modpacks = json.loads((loader.data_dir / "modpacks.json").read_text())
+    write_modpacks(loader, modpacks[:1])
+    loader.load()
+    second = PreparedCatalogue(cache_file=cache_file)
+    assert second.prepare(loader) is False
+    assert json.loads(second.get(LIST_KEY))["count"] == 1
+    second.close()
+
+def test_rebuild_after_release_uses_loaded_revision(loader, tmp_path):
+    loader.load()
+    catalogue = PreparedCatalogue(cache_file=str(tmp_path / "catalogue.cache"))
+    catalogue.prepare(loader)
+    revision = catalogue.revision
+    assert not loader.is_loaded
+
+    # An edit to data/ after startup must not leak into a mirror-triggered rebuild
+    write_modpacks(loader, ["half-written"])
+    catalogue.prepare(loader)
+    assert catalogue.revision == revision
+    catalogue.close()
+
+def test_build_fingerprint_covers_body_code():
+    # Every module build_bodies calls into must be part of the fingerprint
+    for module in ("catalogue", "image_variants", "modpack_mirror", "prepared_catalogue"):
+        assert f"services/{module}.py" in prepared_module.BUILD_SOURCES
+
+def test_changed_code_invalidates_prepared_catalogue(loader, tmp_path, monkeypatch):
+    cache_file = str(tmp_path / "catalogue.cache")
+    loader.load()
+    first = PreparedCatalogue(cache_file=cache_file)
+    first.prepare(loader)
+    first.close()
+
+    monkeypatch.setattr(prepared_module, "BUILD_FINGERPRINT", "changed")
+    second = PreparedCatalogue(cache_file=cache_file)
+    assert second.prepare(loader) is False
+    second.close()
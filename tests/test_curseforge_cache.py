@@ -0,0 +1,64 @@
+import asyncio
+import os
+
+from app.services.curseforge_cache import CurseForgeCache
+
+def test_entries_survive_restart(tmp_path):
+    cache = CurseForgeCache(str(tmp_path))
+    cache.open()
+    asyncio.run(cache.set("mods:1", b'{"data": 1}', 60))
+    cache.close()
+
+    reopened = CurseForgeCache(str(tmp_path))
+    reopened.open()
+    reopened._memory.clear()
+    assert asyncio.run(reopened.get("mods:1")) == b'{"data": 1}'
+    reopened.close()
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = CurseForgeCache(str(tmp_path))
+    cache.open()
+    asyncio.run(cache.set("mods:1", b"{}", 60))
+    cache._memory["mods:1"] = (0.0, b"{}")
+    cache._db.execute("UPDATE entries SET expires_at = 0")
+    assert asyncio.run(cache.get("mods:1")) is None
+    cache.close()
+
+def test_size_cap_counts_entries_from_other_workers(tmp_path):
+    first = CurseForgeCache(str(tmp_path), max_bytes=4096)
+    second = CurseForgeCache(str(tmp_path), max_bytes=4096)
+    first.open()
+    second.open()
+    body = os.urandom(3000)  # Incompressible
+
+    asyncio.run(first.set("mods:1", body, 60))
+    asyncio.run(second.set("mods:2", body, 60))
+    # The second worker saw the first worker's entry and evicted it
+    assert first._stored_bytes() <= 4096
+    assert [key for key, in first._db.execute("SELECT key FROM entries")] == ["mods:2"]
+    first.close()
+    second.close()
+
+def test_disk_errors_are_misses_and_skipped_writes(tmp_path, caplog):
+    cache = CurseForgeCache(str(tmp_path), memory_entries=1)
+    cache.open()
+    cache._db.execute("DROP TABLE entries")
+
+    asyncio.run(cache.set("mods:1", b"one", 60))
+    asyncio.run(cache.set("mods:2", b"two", 60))
+    # mods:1 fell out of memory and the disk read fails: a miss, not an exception
+    assert asyncio.run(cache.get("mods:1")) is None
+    assert asyncio.run(cache.get("mods:2")) == b"two"
+    cache.clear()
+    assert "disk cache write failed" in caplog.text
+    assert "disk cache read failed" in caplog.text
+    cache.close()
+
+def test_unreadable_database_falls_back_to_memory(tmp_path, caplog):
+    (tmp_path / "curseforge.sqlite3").write_bytes(b"not a database" * 100)
+    cache = CurseForgeCache(str(tmp_path))
+    cache.open()
+    assert cache._db is None
+    asyncio.run(cache.set("mods:1", b"one", 60))
+    assert asyncio.run(cache.get("mods:1")) == b"one"
+    assert "using memory only" in caplog.text
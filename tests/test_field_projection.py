@@ -0,0 +1,86 @@
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+import app.services.prepared_catalogue as prepared_module
+from app.services.data_loader import DataLoader
+from app.services.field_projection import ProjectionCache, compile_fields
+from app.services.image_variants import ImageVariants
+from app.services.prepared_catalogue import PreparedCatalogue, modpacks_key, modpack_key
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+PACK = {"id": "pack", "name": "Pack", "ip": "play.example.org", "logo": "https://img/logo.png",
+        "backgroundImage": "https://img/bg.png"}
+
+def publish(catalogue, revision, ip):
+    pack = {**PACK, "ip": ip}
+    catalogue.publish(revision, {
+        modpacks_key("en"): json.dumps({"count": 1, "modpacks": [pack], "ui": {"status": {}}}).encode(),
+        modpack_key("en", "pack"): json.dumps(pack).encode(),
+    }, ["en"], ["pack"], {})
+
+@pytest.fixture
+def catalogue(tmp_path):
+    shared_dir = str(tmp_path / "shared")
+    publish(PreparedCatalogue(shared_dir), "rev1", "one.example.org")
+    worker = PreparedCatalogue(shared_dir, check_interval=0)
+    worker._swap(worker._map(worker._catalogue_path("rev1")))
+    yield worker
+    worker.close()
+
+def test_compile_fields_is_canonical():
+    assert compile_fields("ip, id,ip") == ("id", "ip")
+
+@pytest.mark.parametrize("fields, message", [
+    ("", "No fields requested"),
+    (" , ", "No fields requested"),
+    ("id,secret,other", "Unknown fields: other, secret"),
+])
+def test_compile_fields_rejects_invalid(fields, message):
+    with pytest.raises(ValueError, match=message):
+        compile_fields(fields)
+
+def test_missing_modpack_or_language_is_none(catalogue):
+    projections = ProjectionCache(catalogue)
+    assert projections.modpack("en", "missing", "id") is None
+    assert projections.modpacks("fr", "id") is None
+    assert projections._bodies == {}
+
+def test_list_projection_links_allowed_image_variants(tmp_path, monkeypatch):
+    shutil.copytree(DATA_DIR, tmp_path / "data")
+    modpacks = json.loads((tmp_path / "data" / "modpacks.json").read_text())
+    # pydantic normalizes this URL (percent-encoding, lowercase host), the raw string is the source
+    modpacks[0]["logo"] = "https://CDN.example.com/Ancient Kraft Logo.webp"
+    (tmp_path / "data" / "modpacks.json").write_text(json.dumps(modpacks))
+    loader = DataLoader()
+    loader.data_dir = tmp_path / "data"
+
+    images = ImageVariants(str(tmp_path / "images"), public_base_url="https://api.example.org")
+    monkeypatch.setattr(prepared_module, "image_variants", images)
+    catalogue = PreparedCatalogue(cache_file=str(tmp_path / "catalogue.cache"))
+    catalogue.prepare(loader)
+    projections = ProjectionCache(catalogue)
+
+    listed = json.loads(projections.modpacks("en", "id,logo,backgroundImage"))["modpacks"][0]
+    unprojected = json.loads(catalogue.get(modpacks_key("en")))["modpacks"][0]
+    assert listed["logo"] == unprojected["logo"]
+    assert listed["backgroundImage"] == unprojected["backgroundImage"]
+    key, variant = listed["logo"].split("/")[-2:]
+    assert variant == "thumbnail"
+    assert images._sources[key] == modpacks[0]["logo"]
+    detail = json.loads(projections.modpack("en", modpacks[0]["id"], "logo"))
+    assert detail["logo"].startswith("https://cdn.example.com/")
+    catalogue.close()
+
+def test_cache_is_invalidated_on_revision_change(catalogue, tmp_path):
+    projections = ProjectionCache(catalogue)
+    assert json.loads(projections.modpack("en", "pack", "ip")) == {"ip": "one.example.org"}
+    assert json.loads(projections.modpack("en", "pack", "ip")) == {"ip": "one.example.org"}
+
+    publish(PreparedCatalogue(str(tmp_path / "shared")), "rev2", "two.example.org")
+    assert json.loads(projections.modpack("en", "pack", "ip")) == {"ip": "two.example.org"}
+    assert projections._revision == "rev2"
+    assert len(projections._bodies) == 1
@@ -0,0 +1,126 @@
+import asyncio
+import io
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from app.routers import images
+from app.services import prepared_catalogue as prepared_module
+from app.services.catalogue import build_modpack
+from app.services.image_variants import ImageSourceError, ImageVariants, VARIANTS
+from app.services.prepared_catalogue import PreparedCatalogue
+
+@pytest.fixture
+def source_url(origin):
+    Image.new("RGB", (2000, 1000), (200, 10, 10)).save(origin.root / "background.webp")
+    return f"{origin.url}/background.webp"
+
+@pytest.fixture
+def variants(tmp_path, source_url):
+    image_variants = ImageVariants(str(tmp_path / "images"), public_base_url="https://api.example.com/")
+    image_variants.open()
+    image_variants.set_sources(image_variants.sources_for([{"id": "pack", "backgroundImage": source_url}]))
+    return image_variants
+
+@pytest.fixture
+def client(variants, monkeypatch):
+    monkeypatch.setattr(images, "image_variants", variants)
+    app = FastAPI()
+    app.include_router(images.router, prefix="/v1/images")
+    return TestClient(app)
+
+def test_url_for_links_variant(variants, source_url):
+    key = ImageVariants.key_for(source_url)
+    assert variants.url_for(source_url, "card") == f"https://api.example.com/v1/images/{key}/card"
+
+def test_variant_widths(variants, source_url):
+    key = ImageVariants.key_for(source_url)
+    for variant, width in VARIANTS.items():
+        body, _ = asyncio.run(variants.get(key, variant))
+        assert Image.open(io.BytesIO(body)).size == (width, width // 2)
+
+def test_unknown_key_or_variant(variants, source_url):
+    assert asyncio.run(variants.get("0" * 20, "card")) is None
+    assert asyncio.run(variants.get(ImageVariants.key_for(source_url), "huge")) is None
+
+def test_etag_and_not_modified(client, source_url):
+    path = f"/v1/images/{ImageVariants.key_for(source_url)}/card"
+    response = client.get(path)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/webp"
+    etag = response.headers["etag"]
+
+    # Served from the disk cache with the same strong ETag
+    assert client.get(path).headers["etag"] == etag
+    not_modified = client.get(path, headers={"if-none-match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+def test_eviction_keeps_serving(tmp_path, source_url):
+    image_variants = ImageVariants(str(tmp_path / "images"), max_bytes=1)
+    image_variants.open()
+    image_variants.set_sources(image_variants.sources_for([{"id": "pack", "logo": source_url}]))
+
+    body, etag = asyncio.run(image_variants.get(ImageVariants.key_for(source_url), "thumbnail"))
+    assert body and etag
+    assert list((tmp_path / "images").glob("*.webp")) == []
+
+def test_swapping_to_published_revision_updates_sources(tmp_path, monkeypatch):
+    image_variants = ImageVariants(str(tmp_path / "images"))
+    monkeypatch.setattr(prepared_module, "image_variants", image_variants)
+    shared_dir = str(tmp_path / "shared")
+
+    publisher = PreparedCatalogue(shared_dir)
+    publisher.publish("rev1", {"list": b"{}"}, ["en"], ["pack"], {"old": "https://img/old.webp"})
+    worker = PreparedCatalogue(shared_dir, check_interval=0)
+    worker._swap(worker._map(worker._catalogue_path("rev1")))
+    assert image_variants._sources == {"old": "https://img/old.webp"}
+
+    publisher.publish("rev2", {"list": b"{}"}, ["en"], ["pack"], {"new": "https://img/new.webp"})
+    assert worker.revision == "rev2"
+    assert image_variants._sources == {"new": "https://img/new.webp"}
+
+def test_failed_source_is_not_refetched(tmp_path, origin, monkeypatch):
+    image_variants = ImageVariants(str(tmp_path / "images"))
+    image_variants.open()
+    missing = f"{origin.url}/missing.webp"
+    image_variants.set_sources(image_variants.sources_for([{"id": "pack", "logo": missing}]))
+    key = ImageVariants.key_for(missing)
+
+    fetches = []
+    fetch_and_render = image_variants._fetch_and_render
+
+    async def counting_fetch(source_url):
+        fetches.append(source_url)
+        return await fetch_and_render(source_url)
+
+    monkeypatch.setattr(image_variants, "_fetch_and_render", counting_fetch)
+    for _ in range(3):
+        with pytest.raises(ImageSourceError):
+            asyncio.run(image_variants.get(key, "card"))
+    assert fetches == [missing]
+    assert image_variants._locks == {}
+
+    # Once the retry window passes, the source is fetched again
+    image_variants._failures[key] = 0.0
+    Image.new("RGB", (100, 100)).save(origin.root / "missing.webp")
+    assert asyncio.run(image_variants.get(key, "card")) is not None
+    assert key not in image_variants._failures
+
+def test_detail_links_screenshot_and_collaborator_variants():
+    image_variants = ImageVariants("unused", public_base_url="https://api.example.com")
+    screenshot = "https://CDN.example.com/Screen Shot 1.png"
+    modpack = build_modpack({
+        "id": "pack", "name": "Pack", "version": "1", "minecraftVersion": "1.20.1", "modloader": "forge",
+        "modloaderVersion": "47", "gamemode": "RPG", "primaryColor": "#000000",
+        "logo": "https://img/logo.png", "backgroundImage": "https://img/bg.png", "images": [screenshot],
+        "collaborators": [{"name": "Studio", "logo": "https://img/studio.png"}, {"name": "Solo"}],
+    }, {}, image_links=image_variants.links_for)
+
+    # Keys come from the raw URLs, so they match the sources the endpoint allows
+    allowed = image_variants.sources_for([{"images": [screenshot]}])
+    assert modpack.imageVariants[0].full == f"https://api.example.com/v1/images/{next(iter(allowed))}/full"
+    assert modpack.collaborators[0].logoVariants.thumbnail.endswith("/thumbnail")
+    assert modpack.collaborators[1].logoVariants is None
@@ -0,0 +1,177 @@
+import asyncio
+import hashlib
+import os
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.services.modpack_mirror import ModpackMirror, RangeFileResponse
+
+parse_range = RangeFileResponse._parse_range
+
+def test_parse_range_open_ended():
+    assert parse_range("bytes=100-", 1000) == (100, 999)
+
+def test_parse_range_suffix():
+    assert parse_range("bytes=-10", 1000) == (990, 999)
+    assert parse_range("bytes=-5000", 1000) == (0, 999)
+
+def test_parse_range_clamps_end():
+    assert parse_range("bytes=0-5000", 1000) == (0, 999)
+
+def test_parse_range_unsatisfiable():
+    assert parse_range("bytes=1000-", 1000) == "unsatisfiable"
+    assert parse_range("bytes=50-10", 1000) == "unsatisfiable"
+    assert parse_range("bytes=-0", 1000) == "unsatisfiable"
+
+def test_parse_range_ignores_multi_and_malformed():
+    assert parse_range("bytes=0-10,20-30", 1000) is None
+    assert parse_range("items=0-10", 1000) is None
+    assert parse_range("bytes=-", 1000) is None
+
+@pytest.fixture
+def mirrored(tmp_path, origin):
+    """A mirror that has synced one zip from the local origin"""
+    blob = os.urandom(200_000)
+    (origin.root / "pack.zip").write_bytes(blob)
+    url = f"{origin.url}/pack.zip"
+
+    mirror = ModpackMirror(str(tmp_path / "mirror"))
+    mirror.open()
+    assert asyncio.run(mirror.sync({"pack": url})) is True
+    mirror.reload()
+    return mirror, blob, url
+
+@pytest.fixture
+def client(mirrored):
+    mirror = mirrored[0]
+    app = FastAPI()
+
+    @app.api_route("/download", methods=["GET", "HEAD"])
+    async def download(request: Request):
+        return mirror.file_response(
+            "pack",
+            method=request.method,
+            range_header=request.headers.get("range"),
+            if_range=request.headers.get("if-range")
+        )
+
+    return TestClient(app)
+
+def test_sync_describes_mirrored_zip(mirrored):
+    mirror, blob, url = mirrored
+    info = mirror.describe("pack")
+    assert info["sha256"] == hashlib.sha256(blob).hexdigest()
+    assert info["size"] == len(blob)
+    annotated = mirror.annotate([{"id": "pack", "urlModpackZip": url}])[0]
+    assert annotated["modpackZipSha256"] == info["sha256"]
+    assert annotated["modpackZipMirror"] == "/v1/modpacks/pack/download"
+
+def test_full_download(client, mirrored):
+    blob = mirrored[1]
+    response = client.get("/download")
+    assert response.status_code == 200
+    assert response.content == blob
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["etag"] == f'"{hashlib.sha256(blob).hexdigest()}"'
+
+def test_range_download(client, mirrored):
+    blob = mirrored[1]
+    response = client.get("/download", headers={"range": "bytes=100-199"})
+    assert response.status_code == 206
+    assert response.content == blob[100:200]
+    assert response.headers["content-range"] == f"bytes 100-199/{len(blob)}"
+
+def test_unsatisfiable_range(client, mirrored):
+    response = client.get("/download", headers={"range": f"bytes={len(mirrored[1])}-"})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(mirrored[1])}"
+
+def test_multi_range_serves_full_file(client, mirrored):
+    response = client.get("/download", headers={"range": "bytes=0-10,20-30"})
+    assert response.status_code == 200
+    assert response.content == mirrored[1]
+
+def test_if_range_matching_etag_serves_range(client, mirrored):
+    blob = mirrored[1]
+    etag = f'"{hashlib.sha256(blob).hexdigest()}"'
+    response = client.get("/download", headers={"range": "bytes=-10", "if-range": etag})
+    assert response.status_code == 206
+    assert response.content == blob[-10:]
+
+def test_if_range_mismatch_serves_full_file(client, mirrored):
+    response = client.get("/download", headers={"range": "bytes=10-", "if-range": '"stale"'})
+    assert response.status_code == 200
+    assert response.content == mirrored[1]
+
+def test_resync_unchanged_origin_revalidates(mirrored, origin, monkeypatch):
+    mirror, blob, url = mirrored
+    fetched = []
+    original_fetch = ModpackMirror._fetch
+
+    async def recording_fetch(self, client, fetch_url, current):
+        result = await original_fetch(self, client, fetch_url, current)
+        fetched.append(result)
+        return result
+
+    monkeypatch.setattr(ModpackMirror, "_fetch", recording_fetch)
+    assert asyncio.run(mirror.sync({"pack": url})) is True
+    # The origin answered 304 to If-Modified-Since, so nothing was downloaded
+    assert fetched == [None]
+    assert mirror.reload() is False
+
+def test_resync_replaced_origin_collects_old_object(mirrored, origin, tmp_path):
+    mirror, blob, url = mirrored
+    old_sha = mirror.describe("pack")["sha256"]
+
+    new_blob = os.urandom(1000)
+    zip_path = origin.root / "pack.zip"
+    zip_path.write_bytes(new_blob)
+    stat_result = zip_path.stat()
+    os.utime(zip_path, (stat_result.st_atime, stat_result.st_mtime + 10))
+
+    asyncio.run(mirror.sync({"pack": url}))
+    assert mirror.reload() is True
+    assert mirror.describe("pack")["sha256"] == hashlib.sha256(new_blob).hexdigest()
+    objects = [p.name for p in (tmp_path / "mirror" / "objects").glob("*/*")]
+    assert objects == [hashlib.sha256(new_blob).hexdigest()]
+    assert old_sha not in objects
+
+def test_file_response_reloads_index_on_miss(mirrored, tmp_path):
+    mirror = mirrored[0]
+    # A second worker that loaded the index before the zip was mirrored
+    other = ModpackMirror(str(tmp_path / "mirror"))
+    other._files, other._modpacks = {}, {}
+    assert other.describe("pack") is None
+    assert other.file_response("pack", "GET", None, None) is not None
+
+def test_run_survives_failing_on_change(tmp_path, monkeypatch, caplog):
+    mirror = ModpackMirror(str(tmp_path / "mirror"), sync_interval=3600, poll_interval=0.01)
+    mirror.open()
+    revisions = iter(range(1000))
+    calls = []
+
+    async def sync(targets):
+        return True
+
+    def reload():
+        mirror.revision = str(next(revisions))
+        return True
+
+    def on_change():
+        calls.append(mirror.revision)
+        raise ValueError("bad data")
+
+    monkeypatch.setattr(mirror, "sync", sync)
+    monkeypatch.setattr(mirror, "reload", reload)
+
+    async def run_briefly():
+        task = asyncio.create_task(mirror.run({}, on_change))
+        await asyncio.sleep(0.1)
+        assert not task.done()
+        task.cancel()
+
+    asyncio.run(run_briefly())
+    assert len(calls) > 1
+    assert "Failed to apply modpack mirror change" in caplog.text